@@ -30,6 +30,33 @@ from typing import Dict, Iterable, List, Optional, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_HISTORY_ROOT = REPO_ROOT / "history"
+SELFPLAY_SCRIPT = str(REPO_ROOT / "utils" / "match" / "selfplay.py")
+SPRT_SCRIPT = str(REPO_ROOT / "utils" / "match" / "sprt.py")
+STS_SCRIPT = str(REPO_ROOT / "utils" / "sts" / "sts.py")
+
+SLUG_UNSAFE_RE = re.compile(r"[^A-Za-z0-9._-]+")
+# One theme or TOTAL row of the sts.py summary table.
+STS_ROW_RE = re.compile(
+    r"^([A-Za-z0-9_.-]+)\s+(\d+)\s+(\d+)\s+(\d+)\s+([0-9.]+)%\s+([0-9.]+)%\s+([0-9.]+)%\s*$"
+)
+
+# Settings that change STS scores. Snapshot binaries never change, so a
+# snapshot's latest successful run is reused when these all match. Workers
+# share the CPU under a movetime limit, so they count too.
+STS_RESULT_SETTINGS = (
+    "epd_dir",
+    "pattern",
+    "movetime_ms",
+    "depth",
+    "max_positions",
+    "threads",
+    "hash_mb",
+    "workers",
+    "bm_score",
+)
+# Bump when the STS run payload or how it is produced changes, so runs
+# archived by an older history.py are not reused.
+STS_CACHE_VERSION = 2
 
 
 @dataclass
@@ -66,7 +93,7 @@ def utc_now_iso() -> str:
 
 
 def slugify(text: str) -> str:
-    value = re.sub(r"[^A-Za-z0-9._-]+", "-", text.strip())
+    value = SLUG_UNSAFE_RE.sub("-", text.strip())
     value = value.strip("-._")
     return value or "snapshot"
 
@@ -88,7 +115,8 @@ def write_json(path: Path, payload: object) -> None:
 
 
 def append_jsonl(path: Path, payload: object) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
+    # Every index lives under index/, which ensure_layout() creates at the
+    # start of each command, so no mkdir per appended line.
     with path.open("a", encoding="utf-8") as handle:
         handle.write(json.dumps(payload) + "\n")
 
@@ -152,6 +180,24 @@ def probe_uci_identity(engine_path: Path) -> dict:
     }
 
 
+def run_files(directory: Path, filename: str) -> List[Path]:
+    # Equivalent to sorted(directory.glob(f"*/{filename}")) using one scandir
+    # pass and a stat per subdirectory instead of pathlib's pattern matching.
+    found: List[Path] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    file_path = os.path.join(entry.path, filename)
+                    if os.path.isfile(file_path):
+                        found.append(Path(file_path))
+    except FileNotFoundError:
+        return []
+    # Sort as Paths, not strings: Path ordering compares components, so
+    # "fa/..." lists before "fa-b/..." exactly as with sorted(glob()).
+    return sorted(found)
+
+
 def ensure_layout(root: Path) -> None:
     (root / "engines").mkdir(parents=True, exist_ok=True)
     (root / "matches").mkdir(parents=True, exist_ok=True)
@@ -168,8 +214,9 @@ def load_engine_metadata(root: Path, engine_id: str) -> dict:
     return json.loads(meta_path.read_text())
 
 
-def engine_binary_path(root: Path, engine_id: str) -> Path:
-    meta = load_engine_metadata(root, engine_id)
+def engine_binary_path(root: Path, engine_id: str, meta: Optional[dict] = None) -> Path:
+    if meta is None:
+        meta = load_engine_metadata(root, engine_id)
     path = root / "engines" / engine_id / meta["binary"]["path"]
     if not path.is_file():
         raise FileNotFoundError(f"Snapshot binary missing for {engine_id}: {path}")
@@ -343,7 +390,7 @@ def build_selfplay_command(
     python_bin = args.python or sys.executable
     cmd: List[str] = [
         python_bin,
-        str(REPO_ROOT / "utils" / "match" / "selfplay.py"),
+        SELFPLAY_SCRIPT,
         str(engine1_path),
         str(engine2_path),
         "--name1",
@@ -376,6 +423,8 @@ def build_selfplay_command(
         cmd.extend(["--threads", str(args.threads)])
     if args.hash_mb is not None:
         cmd.extend(["--hash-mb", str(args.hash_mb)])
+    if args.concurrency != 1:
+        cmd.extend(["--concurrency", str(args.concurrency)])
     for opt in args.engine1_opt:
         cmd.extend(["--engine1-opt", opt])
     for opt in args.engine2_opt:
@@ -397,7 +446,7 @@ def build_sprt_command(
     python_bin = args.python or sys.executable
     cmd: List[str] = [
         python_bin,
-        str(REPO_ROOT / "utils" / "match" / "sprt.py"),
+        SPRT_SCRIPT,
         str(engine1_path),
         str(engine2_path),
         "--name1",
@@ -442,6 +491,8 @@ def build_sprt_command(
         cmd.extend(["--threads", str(args.threads)])
     if args.hash_mb is not None:
         cmd.extend(["--hash-mb", str(args.hash_mb)])
+    if args.concurrency != 1:
+        cmd.extend(["--concurrency", str(args.concurrency)])
     for opt in args.engine1_opt:
         cmd.extend(["--engine1-opt", opt])
     for opt in args.engine2_opt:
@@ -584,7 +635,7 @@ def run_archived_sprt(
 def load_matches(root: Path) -> List[MatchRecord]:
     matches: List[MatchRecord] = []
 
-    for summary_path in sorted((root / "matches").glob("*/summary.json")):
+    for summary_path in run_files(root / "matches", "summary.json"):
         try:
             data = json.loads(summary_path.read_text())
         except Exception:
@@ -805,16 +856,17 @@ def filter_leaderboard(leaderboard: List[dict], min_games: int) -> List[dict]:
     return [row for row in leaderboard if int(row.get("games", 0)) >= min_games]
 
 
+def metadata_label(meta: dict, engine_id: str) -> str:
+    label = str(meta.get("label", "")).strip()
+    return label or engine_id
+
+
 def engine_label(root: Path, engine_id: str) -> str:
     meta_path = root / "engines" / engine_id / "metadata.json"
     try:
-        data = json.loads(meta_path.read_text())
-        label = str(data.get("label", "")).strip()
-        if label:
-            return label
+        return metadata_label(json.loads(meta_path.read_text()), engine_id)
     except Exception:
-        pass
-    return engine_id
+        return engine_id
 
 
 def short_engine_name(root: Path, engine_id: str, max_len: int = 24) -> str:
@@ -825,19 +877,21 @@ def short_engine_name(root: Path, engine_id: str, max_len: int = 24) -> str:
 
 
 def parse_sts_summary(output: str) -> dict:
-    row_re = re.compile(
-        r"^([A-Za-z0-9_.-]+)\s+(\d+)\s+(\d+)\s+(\d+)\s+([0-9.]+)%\s+([0-9.]+)%\s+([0-9.]+)%\s*$"
-    )
-
     themes: List[dict] = []
     total: Optional[dict] = None
 
+    # Rows only appear in the table after the last "Theme Summary" header;
+    # skip the per-position log (--show misses/all) in front of it.
+    start = output.rfind("\nTheme Summary\n")
+    if start >= 0:
+        output = output[start + 1 :]
+
     for raw in output.splitlines():
         line = raw.strip()
         if not line or line.startswith("-"):
             continue
 
-        m = row_re.match(line)
+        m = STS_ROW_RE.match(line)
         if not m:
             continue
 
@@ -865,10 +919,48 @@ def parse_sts_summary(output: str) -> dict:
     }
 
 
+def sts_epd_fingerprint(epd_dir: Path, pattern: str) -> str:
+    # Hash the name and contents of every suite file sts.py will load, so
+    # editing, adding or removing an EPD file invalidates cached STS runs.
+    digest = hashlib.sha256()
+    for path in sorted(epd_dir.glob(pattern)):
+        if path.is_file():
+            digest.update(f"{path.name}\0{sha256_file(path)}\n".encode())
+    return digest.hexdigest()
+
+
+def load_cached_sts_run(
+    run_dir: Path,
+    settings: dict,
+    binary_sha256: str,
+    epd_fingerprint: str,
+) -> Optional[dict]:
+    latest_path = run_dir / "latest.json"
+    if not latest_path.is_file():
+        return None
+    try:
+        data = json.loads(latest_path.read_text())
+    except Exception:
+        return None
+    if data.get("status") != "ok":
+        return None
+    if data.get("cache_version") != STS_CACHE_VERSION:
+        return None
+    # Engine ids can be reused for a new build, so match the binary itself.
+    if data.get("binary_sha256") != binary_sha256:
+        return None
+    if data.get("epd_fingerprint") != epd_fingerprint:
+        return None
+    previous = data.get("settings", {})
+    if any(previous.get(key) != settings.get(key) for key in STS_RESULT_SETTINGS):
+        return None
+    return data
+
+
 def write_sts_latest_table(root: Path) -> Path:
     latest_rows: List[dict] = []
 
-    for latest_path in sorted((root / "sts").glob("*/latest.json")):
+    for latest_path in run_files(root / "sts", "latest.json"):
         try:
             data = json.loads(latest_path.read_text())
         except Exception:
@@ -883,7 +975,9 @@ def write_sts_latest_table(root: Path) -> Path:
         latest_rows.append(
             {
                 "engine_id": engine_id,
-                "label": engine_label(root, engine_id),
+                # Runs archive the label they were made with; only older
+                # payloads without it need the snapshot metadata.
+                "label": data.get("engine_label") or engine_label(root, engine_id),
                 "generated_at_utc": data.get("generated_at_utc", ""),
                 "positions": int(total.get("positions", 0)),
                 "score": int(total.get("score", 0)),
@@ -1263,10 +1357,14 @@ def cmd_sts(args: argparse.Namespace) -> int:
         raise RuntimeError("--depth must be > 0")
     if args.max_positions < 0:
         raise RuntimeError("--max-positions must be >= 0")
+    if args.workers <= 0:
+        raise RuntimeError("--workers must be > 0")
 
     engine_ids: List[str] = []
+    # Metadata already read while listing snapshots, reused below.
+    metadata_by_id: Dict[str, dict] = {}
     if args.all:
-        for meta_path in sorted((root / "engines").glob("*/metadata.json")):
+        for meta_path in run_files(root / "engines", "metadata.json"):
             try:
                 data = json.loads(meta_path.read_text())
                 engine_id = str(data.get("engine_id", "")).strip()
@@ -1274,6 +1372,7 @@ def cmd_sts(args: argparse.Namespace) -> int:
                 continue
             if engine_id:
                 engine_ids.append(engine_id)
+                metadata_by_id[engine_id] = data
     else:
         if not args.engine_id:
             raise RuntimeError("Provide <engine_id> or use --all.")
@@ -1288,13 +1387,41 @@ def cmd_sts(args: argparse.Namespace) -> int:
 
     py = args.python or sys.executable
     had_failures = False
+    epd_fingerprint = sts_epd_fingerprint(epd_dir, args.pattern)
+
+    settings = {
+        "epd_dir": str(epd_dir),
+        "pattern": args.pattern,
+        "show": args.show,
+        "movetime_ms": args.movetime_ms if args.depth is None else None,
+        "depth": args.depth,
+        "max_positions": args.max_positions,
+        "threads": args.threads,
+        "hash_mb": args.hash_mb,
+        "workers": args.workers,
+        "bm_score": args.bm_score,
+        "python": py,
+    }
 
     for engine_id in engine_ids:
-        engine_path = engine_binary_path(root, engine_id)
+        meta = metadata_by_id.get(engine_id) or load_engine_metadata(root, engine_id)
+        engine_path = engine_binary_path(root, engine_id, meta)
+        binary_sha256 = meta["binary"]["sha256"]
+        run_dir = root / "sts" / engine_id
+
+        if not args.force:
+            cached = load_cached_sts_run(run_dir, settings, binary_sha256, epd_fingerprint)
+            if cached is not None:
+                total = cached["summary"]["total"]
+                print(
+                    f"STS cached: {engine_id} | {total['score']}/{total['max_score']}"
+                    f" ({total['score_pct']:.2f}%) from {cached['generated_at_utc']}"
+                )
+                continue
 
         cmd = [
             py,
-            str(REPO_ROOT / "utils" / "sts" / "sts.py"),
+            STS_SCRIPT,
             "--engine",
             str(engine_path),
             "--epd",
@@ -1316,6 +1443,8 @@ def cmd_sts(args: argparse.Namespace) -> int:
             cmd.extend(["--threads", str(args.threads)])
         if args.hash_mb is not None:
             cmd.extend(["--hash-mb", str(args.hash_mb)])
+        if args.workers != 1:
+            cmd.extend(["--workers", str(args.workers)])
         if args.bm_score is not None:
             cmd.extend(["--bm-score", str(args.bm_score)])
 
@@ -1328,28 +1457,21 @@ def cmd_sts(args: argparse.Namespace) -> int:
             stderr=subprocess.STDOUT,
         )
 
-        timestamp = datetime.datetime.now(datetime.UTC).strftime("%Y%m%d-%H%M%S")
-        run_dir = root / "sts" / engine_id
-        run_dir.mkdir(parents=True, exist_ok=True)
+        # One clock read names the run file and stamps the payload, so the two
+        # always agree.
+        now = datetime.datetime.now(datetime.UTC)
+        timestamp = now.strftime("%Y%m%d-%H%M%S")
         run_path = run_dir / f"{timestamp}.json"
         latest_path = run_dir / "latest.json"
 
         run_payload: dict = {
             "engine_id": engine_id,
-            "generated_at_utc": utc_now_iso(),
-            "engine_label": engine_label(root, engine_id),
-            "settings": {
-                "epd_dir": str(epd_dir),
-                "pattern": args.pattern,
-                "show": args.show,
-                "movetime_ms": args.movetime_ms if args.depth is None else None,
-                "depth": args.depth,
-                "max_positions": args.max_positions,
-                "threads": args.threads,
-                "hash_mb": args.hash_mb,
-                "bm_score": args.bm_score,
-                "python": py,
-            },
+            "generated_at_utc": now.isoformat(),
+            "engine_label": metadata_label(meta, engine_id),
+            "cache_version": STS_CACHE_VERSION,
+            "binary_sha256": binary_sha256,
+            "epd_fingerprint": epd_fingerprint,
+            "settings": settings,
             "summary": None,
             "exit_code": proc.returncode,
             "raw_output": proc.stdout,
@@ -1405,7 +1527,7 @@ def cmd_list_engines(args: argparse.Namespace) -> int:
     root = Path(args.history_root)
     ensure_layout(root)
 
-    entries = sorted((root / "engines").glob("*/metadata.json"))
+    entries = run_files(root / "engines", "metadata.json")
     if not entries:
         print("No snapshots found.")
         return 0
@@ -1442,7 +1564,7 @@ def cmd_list_sprt(args: argparse.Namespace) -> int:
     root = Path(args.history_root)
     ensure_layout(root)
 
-    summaries = sorted((root / "sprt").glob("*/summary.json"))
+    summaries = run_files(root / "sprt", "summary.json")
     if not summaries:
         print("No SPRT runs found.")
         return 0
@@ -1473,6 +1595,7 @@ def add_selfplay_options(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("--max-plies", type=int, default=300, help="Move-limit draw adjudication")
     parser.add_argument("--threads", type=int, default=None, help="UCI Threads for both engines")
     parser.add_argument("--hash-mb", type=int, default=None, help="UCI Hash MB for both engines")
+    parser.add_argument("--concurrency", type=int, default=1, help="Games played at once by selfplay.py")
     parser.add_argument("--engine1-opt", action="append", default=[], help="Extra UCI option for engine1 (Key=Value)")
     parser.add_argument("--engine2-opt", action="append", default=[], help="Extra UCI option for engine2 (Key=Value)")
     parser.add_argument("--python", default=None, help="Python interpreter for selfplay.py (default: current interpreter)")
@@ -1498,6 +1621,8 @@ def validate_selfplay_args(args: argparse.Namespace, parser: argparse.ArgumentPa
         parser.error("--threads must be > 0")
     if args.hash_mb is not None and args.hash_mb <= 0:
         parser.error("--hash-mb must be > 0")
+    if args.concurrency <= 0:
+        parser.error("--concurrency must be > 0")
     if args.game_time_ms is not None and args.depth is not None:
         parser.error("--game-time-ms and --depth cannot be used together")
 
@@ -1519,6 +1644,7 @@ def add_sprt_options(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("--max-plies", type=int, default=220, help="Draw adjudication ply cap")
     parser.add_argument("--threads", type=int, default=None, help="Threads UCI option for both engines")
     parser.add_argument("--hash-mb", type=int, default=None, help="Hash UCI option for both engines")
+    parser.add_argument("--concurrency", type=int, default=1, help="Games played at once by selfplay.py")
     parser.add_argument("--engine1-opt", action="append", default=[], help="Extra UCI option for engine1 (Key=Value)")
     parser.add_argument("--engine2-opt", action="append", default=[], help="Extra UCI option for engine2 (Key=Value)")
     parser.add_argument("--practical-min-games", type=int, default=120, help="Minimum games before practical stronger check")
@@ -1554,6 +1680,8 @@ def validate_sprt_args(args: argparse.Namespace, parser: argparse.ArgumentParser
         parser.error("--threads must be > 0")
     if args.hash_mb is not None and args.hash_mb <= 0:
         parser.error("--hash-mb must be > 0")
+    if args.concurrency <= 0:
+        parser.error("--concurrency must be > 0")
     if args.practical_min_games < 0:
         parser.error("--practical-min-games must be >= 0")
     if not (0.0 < args.practical_p_threshold < 1.0):
@@ -1623,9 +1751,11 @@ def build_parser() -> argparse.ArgumentParser:
     p_sts.add_argument("--depth", type=int, default=None, help="Fixed search depth per position")
     p_sts.add_argument("--threads", type=int, default=None, help="UCI Threads option")
     p_sts.add_argument("--hash-mb", type=int, default=None, help="UCI Hash option")
+    p_sts.add_argument("--workers", type=int, default=1, help="Parallel single-threaded engines per STS run (sts.py --workers)")
     p_sts.add_argument("--bm-score", type=int, default=10, help="Fallback BM score when no weighted STS metadata")
     p_sts.add_argument("--show", choices=("none", "misses", "all"), default="none", help="Per-position output style")
     p_sts.add_argument("--python", default=None, help="Python interpreter for sts.py")
+    p_sts.add_argument("--force", action="store_true", help="Rerun even if a snapshot already has a successful run with the same settings")
     p_sts.add_argument("--continue-on-error", action="store_true", help="Continue other engines if one STS run fails")
     p_sts.set_defaults(func=cmd_sts)
 
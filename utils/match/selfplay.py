@@ -6,9 +6,11 @@ This script compares two UCI engines with:
 - opening diversification (built-in suite or custom file)
 - optional UCI options per engine
 - Elo-difference estimate with confidence interval
+- concurrent games over several engine pairs driven by one asyncio loop
 
 Examples:
   python utils/match/selfplay.py ./old_sykora ./zig-out/bin/sykora --games 80 --movetime-ms 200
+  python utils/match/selfplay.py ./old_sykora ./zig-out/bin/sykora --games 400 --movetime-ms 100 --concurrency 4
   python utils/match/selfplay.py ./old_sykora ./zig-out/bin/sykora --games 120 --depth 8 --openings none
   python utils/match/selfplay.py ./old_sykora ./zig-out/bin/sykora --games 200 --openings openings.txt --shuffle-openings
 """
@@ -16,20 +18,39 @@ Examples:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import datetime
-import json
+import functools
 import math
 import os
 import random
 import sys
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, Iterator, List, Optional, TextIO
 
 import chess
 import chess.engine
-import chess.pgn
+
+# chess.pgn (and json, imported in main) are only needed when games or a
+# summary are written, so they are imported on first use to keep startup
+# lean for quick regression matches.
+if TYPE_CHECKING:
+    import chess.pgn
+
+# Centipawn value substituted for mate scores when checking adjudication.
+ADJUDICATION_MATE_CP = 100_000
+
+INV_SQRT2 = 1.0 / math.sqrt(2.0)
+
+# PGN tags shared by every game; run_match adds the match date once.
+PGN_BASE_HEADERS: Dict[str, str] = {
+    "Event": "Engine Self-Play Match",
+    "Site": "Localhost",
+}
 
 # 4-ply opening lines in UCI notation.
 # Matches are played in pairs: same opening twice with colors swapped.
@@ -57,6 +78,10 @@ DEFAULT_OPENINGS_UCI: List[str] = [
 ]
 
 
+class SelfPlayAbort(Exception):
+    """Raised inside the match loop to stop all games and exit with status 1."""
+
+
 @dataclass
 class MatchResult:
     engine1_wins: int = 0
@@ -91,6 +116,12 @@ class ClockConfig:
     increment_ms: int
 
 
+@dataclass(frozen=True)
+class AdjudicationConfig:
+    score_cp: int
+    plies: int
+
+
 def parse_option_value(raw: str):
     lower = raw.lower()
     if lower == "true":
@@ -133,141 +164,296 @@ def parse_opening_line(raw: str) -> List[str]:
     return text.split()
 
 
-def validate_opening_line(moves: List[str]) -> bool:
-    board = chess.Board()
+@functools.lru_cache(maxsize=None)
+def cached_move(uci: str) -> chess.Move:
+    # Opening books repeat the same few tokens (e2e4, d2d4, ...); parse each
+    # once and share the immutable Move objects across lines.
+    return chess.Move.from_uci(uci)
+
+
+def validate_opening_line(moves: List[str], board: chess.Board) -> Optional[List[chess.Move]]:
+    """Return the parsed moves if the line is legal from the start position.
+
+    `board` must be at the start position; it is shared across calls and
+    unwound with pop() afterwards instead of building a new Board per line.
+    """
+    parsed: List[chess.Move] = []
     try:
-        for move in moves:
-            board.push_uci(move)
+        for token in moves:
+            move = cached_move(token)
+            if not board.is_legal(move):
+                return None
+            board.push(move)
+            # push() normalizes king-takes-rook castling (e1h1 -> e1g1).
+            parsed.append(board.peek())
     except ValueError:
-        return False
-    return True
+        return None
+    finally:
+        for _ in parsed:
+            board.pop()
+    return parsed
 
 
-def load_openings(spec: str, shuffle: bool, seed: int) -> List[List[str]]:
+def read_opening_lines(spec: str) -> Iterator[List[str]]:
     if spec == "none":
-        openings = [[]]
+        yield []
     elif spec == "default":
-        openings = [parse_opening_line(line) for line in DEFAULT_OPENINGS_UCI]
+        for line in DEFAULT_OPENINGS_UCI:
+            yield parse_opening_line(line)
     else:
         path = Path(spec)
         if not path.is_file():
             raise FileNotFoundError(f"Openings file not found: {path}")
-        openings = []
-        for raw in path.read_text().splitlines():
-            line = raw.strip()
-            if not line or line.startswith("#"):
-                continue
-            moves = parse_opening_line(line)
-            if moves:
-                openings.append(moves)
-
-    valid_openings: List[List[str]] = []
-    for moves in openings:
-        if validate_opening_line(moves):
-            valid_openings.append(moves)
+        # Stream the file so large books are never held in memory twice.
+        with path.open() as handle:
+            for raw in handle:
+                line = raw.strip()
+                if not line or line.startswith("#"):
+                    continue
+                moves = parse_opening_line(line)
+                if moves:
+                    yield moves
+
+
+def load_openings(
+    spec: str,
+    shuffle: bool,
+    seed: int,
+    needed: Optional[int] = None,
+) -> List[List[chess.Move]]:
+    board = chess.Board()
+    valid_openings: List[List[chess.Move]] = []
+    for moves in read_opening_lines(spec):
+        parsed = validate_opening_line(moves, board)
+        if parsed is not None:
+            valid_openings.append(parsed)
 
     if not valid_openings:
         raise ValueError("No valid opening lines available")
 
     if shuffle:
         rng = random.Random(seed)
-        rng.shuffle(valid_openings)
+        # When the match only reaches a small prefix of a large book, draw
+        # just that many lines instead of shuffling the whole list.
+        if needed is not None and needed < len(valid_openings) // 2:
+            valid_openings = rng.sample(valid_openings, needed)
+        else:
+            rng.shuffle(valid_openings)
 
     return valid_openings
 
 
+def parse_cpu_range(raw: str) -> set[int]:
+    text = raw.strip().lower()
+    lo_text, sep, hi_text = text.partition("-")
+    try:
+        lo = int(lo_text.removeprefix("cpu"))
+        hi = int(hi_text.removeprefix("cpu")) if sep else lo
+    except ValueError:
+        raise ValueError(f"Invalid CPU range '{raw}' (expected N or N-M)") from None
+    if lo < 0 or hi < lo:
+        raise ValueError(f"Invalid CPU range '{raw}'")
+    return set(range(lo, hi + 1))
+
+
+def parse_affinity(spec: str, pairs: int) -> List[set[int]]:
+    """Return one disjoint CPU set per engine process.
+
+    The result is ordered engine1, engine2 for pair 0, then pair 1, and so on.
+    `auto` splits the CPUs available to this process evenly; otherwise the
+    spec lists one range per engine, e.g. `0-3,4-7` or `cpu0-cpu3,cpu4-cpu7`.
+    """
+    engines = 2 * pairs
+    if spec == "auto":
+        cpus = sorted(os.sched_getaffinity(0))
+        per_engine = len(cpus) // engines
+        if per_engine == 0:
+            raise ValueError(f"--affinity auto needs at least {engines} CPUs")
+        return [set(cpus[i * per_engine : (i + 1) * per_engine]) for i in range(engines)]
+
+    parts = spec.split(",")
+    if len(parts) != engines:
+        raise ValueError(
+            f"Invalid --affinity '{spec}' (expected auto or {engines} comma-separated ranges)"
+        )
+    cpu_sets = [parse_cpu_range(part) for part in parts]
+    seen: set[int] = set()
+    for cpu_set in cpu_sets:
+        if seen & cpu_set:
+            raise ValueError(f"--affinity CPU sets overlap: '{spec}'")
+        seen |= cpu_set
+    return cpu_sets
+
+
 def build_limit(movetime_ms: int, depth: Optional[int]) -> chess.engine.Limit:
     if depth is not None:
         return chess.engine.Limit(time=movetime_ms / 1000.0, depth=depth)
     return chess.engine.Limit(time=movetime_ms / 1000.0)
 
 
-def configure_engine(
-    engine: chess.engine.SimpleEngine,
+async def configure_engine(
+    engine: chess.engine.UciProtocol,
     options: Dict[str, object],
     verbose: bool,
 ) -> None:
     if not options:
         return
 
+    # Snapshot the option names once; engine.options is a case-insensitive
+    # mapping, so compare lower-cased names to keep the same matching.
+    known = frozenset(name.lower() for name in engine.options)
     accepted: Dict[str, object] = {}
     for name, value in options.items():
-        if name in engine.options:
+        if name.lower() in known:
             accepted[name] = value
         elif verbose:
             print(f"Warning: engine does not expose option '{name}', skipping")
 
     if accepted:
-        engine.configure(accepted)
+        await engine.configure(accepted)
 
 
-def safe_quit(engine: Optional[chess.engine.SimpleEngine]) -> None:
+def pin_engine(engine: chess.engine.UciProtocol, cpus: set[int]) -> None:
+    # Pin before configure_engine so helper threads spawned for Threads=N
+    # inherit the mask from the engine's main thread.
+    pid = engine.transport.get_pid()
+    os.sched_setaffinity(pid, cpus)
+
+
+async def open_engine(
+    path: str,
+    options: Dict[str, object],
+    cpus: Optional[set[int]],
+    verbose: bool,
+) -> chess.engine.UciProtocol:
+    _, engine = await chess.engine.popen_uci(path)
+    if cpus is not None:
+        pin_engine(engine, cpus)
+    await configure_engine(engine, options, verbose)
+    return engine
+
+
+async def safe_quit(engine: Optional[chess.engine.UciProtocol]) -> None:
     if engine is None:
         return
     try:
-        engine.quit()
+        await engine.quit()
     except chess.engine.EngineTerminatedError:
         pass
 
 
-def apply_opening_to_game(game: chess.pgn.Game, board: chess.Board, opening_moves: List[str]) -> chess.pgn.ChildNode:
-    node: chess.pgn.Game | chess.pgn.ChildNode = game
-    for move in opening_moves:
-        chess_move = chess.Move.from_uci(move)
-        board.push(chess_move)
-        node = node.add_variation(chess_move)
-    return node
+def white_score_cp(info: chess.engine.InfoDict) -> Optional[int]:
+    score = info.get("score")
+    if score is None:
+        return None
+    return score.white().score(mate_score=ADJUDICATION_MATE_CP)
+
+
+def adjudicated_winner(scores: Deque[int], adjudication: AdjudicationConfig) -> Optional[chess.Color]:
+    # Both engines must have reported a decisive score for the same side on
+    # each of the last `plies` moves.
+    if len(scores) < adjudication.plies:
+        return None
+    if all(score >= adjudication.score_cp for score in scores):
+        return chess.WHITE
+    if all(score <= -adjudication.score_cp for score in scores):
+        return chess.BLACK
+    return None
+
+
+def result_text(winner: Optional[chess.Color]) -> str:
+    if winner is None:
+        return "1/2-1/2"
+    return "1-0" if winner == chess.WHITE else "0-1"
 
 
-def play_single_game(
-    white_engine: chess.engine.SimpleEngine,
-    black_engine: chess.engine.SimpleEngine,
+def game_over_reason(board: chess.Board) -> Optional[str]:
+    """Return the termination label for a finished game, or None to keep playing.
+
+    Checked once per pushed move instead of is_game_over() plus separate
+    repetition and fifty-move probes, so the legal move scan runs once and
+    the fivefold/seventy-five-move rules (implied by the draws below) are
+    never evaluated. A draw is taken once the third repetition actually
+    exists, not when the side to move could merely claim it.
+    """
+    if board.is_repetition(3):
+        return "THREEFOLD_REPETITION"
+    if not any(board.generate_legal_moves()):
+        return "CHECKMATE" if board.is_check() else "STALEMATE"
+    if board.halfmove_clock >= 100:
+        return "FIFTY_MOVES"
+    if board.is_insufficient_material():
+        return "INSUFFICIENT_MATERIAL"
+    return None
+
+
+async def play_single_game(
+    white_engine: chess.engine.UciProtocol,
+    black_engine: chess.engine.UciProtocol,
     white_name: str,
     black_name: str,
     fixed_limit: Optional[chess.engine.Limit],
     clock: Optional[ClockConfig],
-    opening_moves: List[str],
+    opening_moves: List[chess.Move],
     round_number: int,
     max_plies: int,
-    verbose: bool,
-) -> tuple[chess.pgn.Game, Optional[chess.Color], str]:
+    log: List[str],
+    base_headers: Dict[str, str],
+    record_pgn: bool,
+    adjudication: Optional[AdjudicationConfig] = None,
+) -> tuple[Optional[chess.pgn.Game], Optional[chess.Color], str]:
     board = chess.Board()
-    game = chess.pgn.Game()
-    game.headers["Event"] = "Engine Self-Play Match"
-    game.headers["Site"] = "Localhost"
-    game.headers["Date"] = datetime.date.today().strftime("%Y.%m.%d")
-    game.headers["Round"] = str(round_number)
-    game.headers["White"] = white_name
-    game.headers["Black"] = black_name
-    if opening_moves:
-        game.headers["OpeningLine"] = " ".join(opening_moves)
-
-    node = apply_opening_to_game(game, board, opening_moves)
+    for move in opening_moves:
+        board.push(move)
+
+    def finish(
+        winner: Optional[chess.Color],
+        termination: str,
+    ) -> tuple[Optional[chess.pgn.Game], Optional[chess.Color], str]:
+        # The PGN is built once from the move stack when the game ends rather
+        # than growing a node chain every ply, and not at all when nothing
+        # will be written. Tags go to Game() in one dict instead of filling
+        # the default "?" roster and overwriting it key by key; base_headers
+        # already carries the match-wide tags and OpeningLine.
+        if not record_pgn:
+            return None, winner, termination
+        import chess.pgn
+
+        game = chess.pgn.Game(
+            {
+                **base_headers,
+                "Round": str(round_number),
+                "White": white_name,
+                "Black": black_name,
+                "Result": result_text(winner),
+                "Termination": termination,
+            }
+        )
+        game.add_line(board.move_stack)
+        return game, winner, termination
 
     plies_played = 0
-    termination = "Normal"
-    white_time_ms = float(clock.game_time_ms) if clock is not None else 0.0
-    black_time_ms = float(clock.game_time_ms) if clock is not None else 0.0
-
-    # Do not auto-claim a draw merely because the side to move has a legal
-    # move that could create the third occurrence. Let the engine choose it,
-    # then adjudicate once the repeated position actually exists.
-    while (
-        not board.is_game_over(claim_draw=False)
-        and not board.is_repetition(3)
-        and not board.is_fifty_moves()
-    ):
+    termination = game_over_reason(board)
+    # Per-side state indexed by board.turn (chess.BLACK == 0, chess.WHITE == 1).
+    engines_by_turn = (black_engine, white_engine)
+    initial_time_ms = float(clock.game_time_ms) if clock is not None else 0.0
+    time_left_ms = [initial_time_ms, initial_time_ms]
+    recent_scores: Deque[int] = deque(maxlen=adjudication.plies if adjudication is not None else 1)
+
+    while termination is None:
         if plies_played >= max_plies:
-            termination = f"Move limit ({max_plies} plies)"
-            game.headers["Result"] = "1/2-1/2"
-            game.headers["Termination"] = termination
-            if verbose:
-                print(f"  Terminated as draw at move limit ({max_plies} plies)")
-            return game, None, termination
+            log.append(f"  Terminated as draw at move limit ({max_plies} plies)")
+            return finish(None, f"Move limit ({max_plies} plies)")
 
-        engine = white_engine if board.turn == chess.WHITE else black_engine
-        side = "White" if board.turn == chess.WHITE else "Black"
-        mover_is_white = board.turn == chess.WHITE
+        if adjudication is not None:
+            adjudicated = adjudicated_winner(recent_scores, adjudication)
+            if adjudicated is not None:
+                log.append(f"  Adjudicated {result_text(adjudicated)} after {plies_played} plies")
+                return finish(adjudicated, "Score adjudication")
+
+        turn = board.turn
+        engine = engines_by_turn[turn]
+        side = chess.COLOR_NAMES[turn].capitalize()
 
         if clock is None:
             if fixed_limit is None:
@@ -275,92 +461,64 @@ def play_single_game(
             limit = fixed_limit
         else:
             limit = chess.engine.Limit(
-                white_clock=max(0.001, white_time_ms / 1000.0),
-                black_clock=max(0.001, black_time_ms / 1000.0),
+                white_clock=max(0.001, time_left_ms[chess.WHITE] / 1000.0),
+                black_clock=max(0.001, time_left_ms[chess.BLACK] / 1000.0),
                 white_inc=clock.increment_ms / 1000.0,
                 black_inc=clock.increment_ms / 1000.0,
             )
 
         try:
             start_time = time.monotonic()
-            play_result = engine.play(board, limit)
+            play_result = await engine.play(board, limit, info=chess.engine.INFO_SCORE)
             elapsed_ms = (time.monotonic() - start_time) * 1000.0
         except chess.engine.EngineTerminatedError:
             termination = f"{side} engine crashed"
-            winner = chess.BLACK if board.turn == chess.WHITE else chess.WHITE
-            game.headers["Result"] = "0-1" if winner == chess.BLACK else "1-0"
-            game.headers["Termination"] = termination
-            if verbose:
-                print(f"  {termination}")
-            return game, winner, termination
+            log.append(f"  {termination}")
+            return finish(not turn, termination)
         except Exception as exc:
             termination = f"Engine error: {exc}"
-            winner = chess.BLACK if board.turn == chess.WHITE else chess.WHITE
-            game.headers["Result"] = "0-1" if winner == chess.BLACK else "1-0"
-            game.headers["Termination"] = termination
-            if verbose:
-                print(f"  {termination}")
-            return game, winner, termination
+            log.append(f"  {termination}")
+            return finish(not turn, termination)
 
         if play_result.move is None:
             termination = f"{side} returned no move"
-            winner = chess.BLACK if board.turn == chess.WHITE else chess.WHITE
-            game.headers["Result"] = "0-1" if winner == chess.BLACK else "1-0"
-            game.headers["Termination"] = termination
-            if verbose:
-                print(f"  {termination}")
-            return game, winner, termination
+            log.append(f"  {termination}")
+            return finish(not turn, termination)
 
         if clock is not None:
-            if mover_is_white:
-                white_time_ms = white_time_ms - elapsed_ms + float(clock.increment_ms)
-                if white_time_ms <= 0.0:
-                    termination = "Time forfeit"
-                    winner = chess.BLACK
-                    game.headers["Result"] = "0-1"
-                    game.headers["Termination"] = termination
-                    if verbose:
-                        print("  White flagged")
-                    return game, winner, termination
+            time_left_ms[turn] = time_left_ms[turn] - elapsed_ms + float(clock.increment_ms)
+            if time_left_ms[turn] <= 0.0:
+                log.append(f"  {side} flagged")
+                return finish(not turn, "Time forfeit")
+
+        if adjudication is not None:
+            score_cp = white_score_cp(play_result.info)
+            if score_cp is None:
+                recent_scores.clear()
             else:
-                black_time_ms = black_time_ms - elapsed_ms + float(clock.increment_ms)
-                if black_time_ms <= 0.0:
-                    termination = "Time forfeit"
-                    winner = chess.WHITE
-                    game.headers["Result"] = "1-0"
-                    game.headers["Termination"] = termination
-                    if verbose:
-                        print("  Black flagged")
-                    return game, winner, termination
+                recent_scores.append(score_cp)
 
         board.push(play_result.move)
-        node = node.add_variation(play_result.move)
         plies_played += 1
+        termination = game_over_reason(board)
 
-    outcome = board.outcome(claim_draw=False)
-    if board.is_repetition(3):
-        result_text = "1/2-1/2"
-        winner = None
-        termination = "THREEFOLD_REPETITION"
-    elif board.is_fifty_moves():
-        result_text = "1/2-1/2"
-        winner = None
-        termination = "FIFTY_MOVES"
-    elif outcome is None:
-        result_text = "*"
-        winner: Optional[chess.Color] = None
-        termination = "Unknown"
-    else:
-        result_text = board.result(claim_draw=False)
-        winner = outcome.winner
-        termination = str(outcome.termination).replace("Termination.", "")
-    game.headers["Result"] = result_text
-    game.headers["Termination"] = termination
+    winner = not board.turn if termination == "CHECKMATE" else None
+    log.append(f"  Plies: {plies_played}, Result: {result_text(winner)}, Termination: {termination}")
+    return finish(winner, termination)
 
-    if verbose:
-        print(f"  Plies: {plies_played}, Result: {result_text}, Termination: {termination}")
 
-    return game, winner, termination
+def export_pgn(handle: TextIO, game: chess.pgn.Game) -> None:
+    # Stream the game node-by-node instead of building str(game) in memory.
+    # columns=None keeps the single-line movetext that str(game) produced;
+    # games never carry comments or variations, so skip visiting them.
+    import chess.pgn
+
+    game.accept(chess.pgn.FileExporter(handle, columns=None, comments=False, variations=False))
+
+
+def write_pgn(path: Path, game: chess.pgn.Game) -> None:
+    with path.open("w") as handle:
+        export_pgn(handle, game)
 
 
 def score_to_elo(score_rate: float) -> float:
@@ -393,7 +551,7 @@ def estimate_elo(result: MatchResult) -> EloEstimate:
     # Two-sided p-value against H0: equal strength (p = 0.5).
     sigma0 = math.sqrt(0.25 / n)
     z = (p - 0.5) / sigma0
-    p_value = math.erfc(abs(z) / math.sqrt(2.0))
+    p_value = math.erfc(abs(z) * INV_SQRT2)
 
     return EloEstimate(
         score_rate=p,
@@ -404,9 +562,7 @@ def estimate_elo(result: MatchResult) -> EloEstimate:
     )
 
 
-def print_summary(result: MatchResult, name1: str, name2: str) -> None:
-    elo = estimate_elo(result)
-
+def print_summary(result: MatchResult, elo: EloEstimate, name1: str, name2: str) -> None:
     print("\n" + "=" * 68)
     print("MATCH SUMMARY")
     print("=" * 68)
@@ -432,13 +588,13 @@ def print_summary(result: MatchResult, name1: str, name2: str) -> None:
 
 def make_summary(
     result: MatchResult,
+    elo: EloEstimate,
     name1: str,
     name2: str,
     args: argparse.Namespace,
     engine1_path: str,
     engine2_path: str,
 ) -> dict:
-    elo = estimate_elo(result)
     now = datetime.datetime.now(datetime.UTC).isoformat()
     return {
         "generated_at_utc": now,
@@ -460,8 +616,12 @@ def make_summary(
             "shuffle_openings": bool(args.shuffle_openings),
             "seed": args.seed,
             "max_plies": args.max_plies,
+            "adjudicate_cp": args.adjudicate_cp,
+            "adjudicate_plies": args.adjudicate_plies,
             "threads": args.threads,
             "hash_mb": args.hash_mb,
+            "concurrency": args.concurrency,
+            "affinity": args.affinity,
             "engine1_opt": list(args.engine1_opt),
             "engine2_opt": list(args.engine2_opt),
         },
@@ -535,9 +695,35 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--seed", type=int, default=1, help="Random seed for opening shuffle")
 
     parser.add_argument("--max-plies", type=int, default=300, help="Adjudicate draw after this many plies")
+    parser.add_argument(
+        "--adjudicate-plies",
+        type=int,
+        default=None,
+        help="Adjudicate a win once this many consecutive engine scores favor the same side (default: off)",
+    )
+    parser.add_argument(
+        "--adjudicate-cp",
+        type=int,
+        default=800,
+        help="Score threshold in centipawns for --adjudicate-plies; mate scores always count (default: 800)",
+    )
 
     parser.add_argument("--threads", type=int, default=None, help="Set Threads for both engines")
     parser.add_argument("--hash-mb", type=int, default=None, help="Set Hash (MB) for both engines")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of games played at once, each by its own engine pair (default: 1)",
+    )
+    parser.add_argument(
+        "--affinity",
+        default=None,
+        help=(
+            "Pin engines to disjoint CPUs: auto, or one range per engine such as 0-3,4-7 "
+            "(engine1, engine2 for each pair in turn; Linux only)"
+        ),
+    )
     parser.add_argument(
         "--engine1-opt",
         action="append",
@@ -552,6 +738,7 @@ def parse_args() -> argparse.Namespace:
     )
 
     parser.add_argument("--output-dir", default=None, help="Directory for per-game PGNs")
+    parser.add_argument("--pgn-file", default=None, help="Append every game to this single PGN file")
     parser.add_argument(
         "--summary-json",
         default=None,
@@ -569,6 +756,10 @@ def parse_args() -> argparse.Namespace:
         parser.error("--depth must be > 0")
     if args.max_plies <= 0:
         parser.error("--max-plies must be > 0")
+    if args.adjudicate_plies is not None and args.adjudicate_plies <= 0:
+        parser.error("--adjudicate-plies must be > 0")
+    if args.adjudicate_cp <= 0:
+        parser.error("--adjudicate-cp must be > 0")
     if args.game_time_ms is not None and args.game_time_ms <= 0:
         parser.error("--game-time-ms must be > 0")
     if args.inc_ms < 0:
@@ -579,6 +770,27 @@ def parse_args() -> argparse.Namespace:
         parser.error("--threads must be > 0")
     if args.hash_mb is not None and args.hash_mb <= 0:
         parser.error("--hash-mb must be > 0")
+    if args.concurrency <= 0:
+        parser.error("--concurrency must be > 0")
+    # Only the side to move searches, so each concurrent game keeps about
+    # one engine's worth of threads busy. Quiet callers (sprt.py runs one
+    # selfplay.py per batch) warn once themselves.
+    cpu_count = os.cpu_count() or 1
+    busy_threads = args.concurrency * (args.threads or 1)
+    if busy_threads > cpu_count and not args.quiet:
+        print(
+            f"Warning: --concurrency {args.concurrency} x {args.threads or 1} thread(s) exceeds"
+            f" {cpu_count} CPUs; engines will compete for cores and lose effective time",
+            file=sys.stderr,
+        )
+
+    if args.affinity is not None:
+        if not hasattr(os, "sched_setaffinity"):
+            parser.error("--affinity is not supported on this platform")
+        try:
+            parse_affinity(args.affinity, args.concurrency)
+        except ValueError as exc:
+            parser.error(str(exc))
 
     if not os.path.isfile(args.engine1):
         parser.error(f"engine1 not found: {args.engine1}")
@@ -590,16 +802,23 @@ def parse_args() -> argparse.Namespace:
 
 def run_match(args: argparse.Namespace) -> MatchResult:
     verbose = not args.quiet
-    openings = load_openings(args.openings, args.shuffle_openings, args.seed)
+    # Each opening is played twice (colors swapped).
+    openings = load_openings(args.openings, args.shuffle_openings, args.seed, needed=(args.games + 1) // 2)
     clock = (
         ClockConfig(game_time_ms=args.game_time_ms, increment_ms=args.inc_ms)
         if args.game_time_ms is not None
         else None
     )
     limit = None if clock is not None else build_limit(args.movetime_ms, args.depth)
+    adjudication = (
+        AdjudicationConfig(score_cp=args.adjudicate_cp, plies=args.adjudicate_plies)
+        if args.adjudicate_plies is not None
+        else None
+    )
 
     engine1_opts = parse_uci_options(args.engine1_opt)
     engine2_opts = parse_uci_options(args.engine2_opt)
+    affinity = parse_affinity(args.affinity, args.concurrency) if args.affinity is not None else None
 
     if args.threads is not None:
         engine1_opts.setdefault("Threads", args.threads)
@@ -611,6 +830,10 @@ def run_match(args: argparse.Namespace) -> MatchResult:
     output_dir = Path(args.output_dir) if args.output_dir else None
     if output_dir:
         output_dir.mkdir(parents=True, exist_ok=True)
+    pgn_path = Path(args.pgn_file) if args.pgn_file else None
+    if pgn_path:
+        pgn_path.parent.mkdir(parents=True, exist_ok=True)
+    record_pgn = output_dir is not None or pgn_path is not None
 
     if verbose:
         print("=" * 68)
@@ -627,29 +850,37 @@ def run_match(args: argparse.Namespace) -> MatchResult:
             )
         print(f"Openings: {args.openings} ({len(openings)} lines)")
         print("Pairing: same opening twice, colors swapped")
+        if args.concurrency > 1:
+            print(f"Concurrency: {args.concurrency} engine pairs")
         print("=" * 68)
 
-    result = MatchResult()
-
-    engine1: Optional[chess.engine.SimpleEngine] = None
-    engine2: Optional[chess.engine.SimpleEngine] = None
+    # Tag templates are built once per opening line, not once per game.
+    match_headers = {**PGN_BASE_HEADERS, "Date": datetime.date.today().strftime("%Y.%m.%d")}
+    opening_headers: List[Dict[str, str]] = []
+    for opening_moves in openings:
+        headers = dict(match_headers)
+        if opening_moves:
+            headers["OpeningLine"] = " ".join(move.uci() for move in opening_moves)
+        opening_headers.append(headers)
+
+    def save_game(game: chess.pgn.Game, round_number: int) -> None:
+        if output_dir:
+            write_pgn(output_dir / f"game_{round_number:04d}.pgn", game)
+        if pgn_handle is not None:
+            export_pgn(pgn_handle, game)
 
-    try:
-        engine1 = chess.engine.SimpleEngine.popen_uci(args.engine1)
-        engine2 = chess.engine.SimpleEngine.popen_uci(args.engine2)
-    except Exception as exc:
-        print(f"Failed to start engines: {exc}", file=sys.stderr)
-        raise SystemExit(1)
-
-    try:
-        configure_engine(engine1, engine1_opts, verbose)
-        configure_engine(engine2, engine2_opts, verbose)
+    result = MatchResult()
+    # Shared by every pair's coroutine; safe because they all run on one
+    # event loop thread and only advance it between awaits.
+    game_indices = iter(range(args.games))
 
-        for game_index in range(args.games):
+    async def play_pair(engine1: chess.engine.UciProtocol, engine2: chess.engine.UciProtocol) -> None:
+        for game_index in game_indices:
             round_number = game_index + 1
 
             opening_idx = (game_index // 2) % len(openings)
             opening_moves = openings[opening_idx]
+            base_headers = opening_headers[opening_idx]
             swap_colors = (game_index % 2) == 1
 
             if not swap_colors:
@@ -659,12 +890,19 @@ def run_match(args: argparse.Namespace) -> MatchResult:
                 white_engine, black_engine = engine2, engine1
                 white_name, black_name = args.name2, args.name1
 
-            if verbose:
-                opening_text = " ".join(opening_moves) if opening_moves else "(none)"
-                print(f"Game {round_number}/{args.games}: {white_name} (W) vs {black_name} (B)")
-                print(f"  Opening: {opening_text}")
-
-            game, winner, termination = play_single_game(
+            log = [
+                f"Game {round_number}/{args.games}: {white_name} (W) vs {black_name} (B)",
+                f"  Opening: {base_headers.get('OpeningLine', '(none)')}",
+            ]
+            # A single pair announces each game as it starts. Concurrent pairs
+            # narrate each game as one block once it finishes so their lines
+            # do not interleave on stdout.
+            if verbose and args.concurrency == 1:
+                sys.stdout.write("\n".join(log) + "\n")
+                sys.stdout.flush()
+                log = []
+
+            game, winner, termination = await play_single_game(
                 white_engine=white_engine,
                 black_engine=black_engine,
                 white_name=white_name,
@@ -674,7 +912,10 @@ def run_match(args: argparse.Namespace) -> MatchResult:
                 opening_moves=opening_moves,
                 round_number=round_number,
                 max_plies=args.max_plies,
-                verbose=verbose,
+                log=log,
+                base_headers=base_headers,
+                record_pgn=record_pgn,
+                adjudication=adjudication,
             )
 
             if (
@@ -682,43 +923,92 @@ def run_match(args: argparse.Namespace) -> MatchResult:
                 or termination.startswith("Engine error:")
                 or termination.endswith("returned no move")
             ):
-                print(
-                    f"Aborting self-play: game {round_number} ended with engine failure ({termination}).",
-                    file=sys.stderr,
+                if verbose:
+                    sys.stdout.write("\n".join(log) + "\n")
+                    sys.stdout.flush()
+                raise SelfPlayAbort(
+                    f"Aborting self-play: game {round_number} ended with engine failure ({termination})."
                 )
-                raise SystemExit(1)
 
+            # engine1 plays White unless colors are swapped, so it won exactly
+            # when the winning color differs from swap_colors (WHITE is True).
             if winner is None:
                 result.draws += 1
-            elif winner == chess.WHITE:
-                if not swap_colors:
-                    result.engine1_wins += 1
-                else:
-                    result.engine2_wins += 1
+            elif winner != swap_colors:
+                result.engine1_wins += 1
             else:
-                if not swap_colors:
-                    result.engine2_wins += 1
-                else:
-                    result.engine1_wins += 1
+                result.engine2_wins += 1
 
-            if output_dir:
-                (output_dir / f"game_{round_number:04d}.pgn").write_text(str(game) + "\n\n")
+            if game is not None and pgn_writer is not None:
+                pgn_writes.append(pgn_writer.submit(save_game, game, round_number))
 
             if verbose:
-                print(
+                log.append(
                     f"  Running score: {args.name1} {result.engine1_score:.1f} - {result.engine2_score:.1f} {args.name2}"
                 )
-                print()
+                # One write and one flush per game: progress stays live when
+                # stdout is a pipe (history.py mirrors it line by line)
+                # without paying a syscall per line on a terminal.
+                sys.stdout.write("\n".join(log) + "\n\n")
+                sys.stdout.flush()
+
+    async def play_match() -> None:
+        paths_and_opts = [(args.engine1, engine1_opts), (args.engine2, engine2_opts)] * args.concurrency
+        # Every pair repeats the same two engines, so only the first pair
+        # reports options they do not expose.
+        opened = await asyncio.gather(
+            *(
+                open_engine(path, opts, affinity[i] if affinity is not None else None, verbose and i < 2)
+                for i, (path, opts) in enumerate(paths_and_opts)
+            ),
+            return_exceptions=True,
+        )
+        engines = [engine for engine in opened if isinstance(engine, chess.engine.UciProtocol)]
+        try:
+            for failure in opened:
+                if isinstance(failure, chess.engine.EngineError):
+                    raise failure
+                if isinstance(failure, BaseException):
+                    raise SelfPlayAbort(f"Failed to start engines: {failure}")
+
+            workers = [
+                asyncio.create_task(play_pair(engines[2 * i], engines[2 * i + 1]))
+                for i in range(args.concurrency)
+            ]
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            await asyncio.gather(*(safe_quit(engine) for engine in engines))
+
+    pgn_handle = pgn_path.open("a") if pgn_path else None
+    # Finished games are exported on one background thread so each engine
+    # pair starts its next game without waiting on PGN serialization; the
+    # single worker keeps writes to the shared --pgn-file handle ordered.
+    pgn_writer = ThreadPoolExecutor(max_workers=1) if record_pgn else None
+    pgn_writes: List[Future] = []
+    try:
+        asyncio.run(play_match())
+    except SelfPlayAbort as exc:
+        print(exc, file=sys.stderr)
+        raise SystemExit(1)
     except chess.engine.EngineTerminatedError as exc:
         print(f"Engine terminated unexpectedly during self-play: {exc}", file=sys.stderr)
         raise SystemExit(1)
     except chess.engine.EngineError as exc:
         print(f"Engine protocol/configuration error during self-play: {exc}", file=sys.stderr)
         raise SystemExit(1)
-
     finally:
-        safe_quit(engine1)
-        safe_quit(engine2)
+        if pgn_writer is not None:
+            pgn_writer.shutdown(wait=True)
+        if pgn_handle is not None:
+            pgn_handle.close()
+
+    for write in pgn_writes:
+        write.result()
 
     return result
 
@@ -726,19 +1016,23 @@ def run_match(args: argparse.Namespace) -> MatchResult:
 def main() -> None:
     args = parse_args()
     result = run_match(args)
-    summary = make_summary(
-        result=result,
-        name1=args.name1,
-        name2=args.name2,
-        args=args,
-        engine1_path=args.engine1,
-        engine2_path=args.engine2,
-    )
+    elo = estimate_elo(result)
     if args.summary_json:
+        import json
+
+        summary = make_summary(
+            result=result,
+            elo=elo,
+            name1=args.name1,
+            name2=args.name2,
+            args=args,
+            engine1_path=args.engine1,
+            engine2_path=args.engine2,
+        )
         summary_path = Path(args.summary_json)
         summary_path.parent.mkdir(parents=True, exist_ok=True)
         summary_path.write_text(json.dumps(summary, indent=2) + "\n")
-    print_summary(result, args.name1, args.name2)
+    print_summary(result, elo, args.name1, args.name2)
 
     # Exit code semantics for CI:
     # 0 -> candidate won, 1 -> baseline won, 2 -> exact tie
@@ -92,6 +92,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--max-plies", type=int, default=220, help="Draw adjudication ply cap")
     parser.add_argument("--threads", type=int, default=None, help="Threads UCI option for both engines")
     parser.add_argument("--hash-mb", type=int, default=None, help="Hash UCI option for both engines")
+    parser.add_argument("--concurrency", type=int, default=1, help="Games played at once by selfplay.py")
     parser.add_argument("--engine1-opt", action="append", default=[], help="Extra UCI option for engine1 (Key=Value)")
     parser.add_argument("--engine2-opt", action="append", default=[], help="Extra UCI option for engine2 (Key=Value)")
 
@@ -140,6 +141,17 @@ def parse_args() -> argparse.Namespace:
         parser.error("--game-time-ms and --depth cannot be used together")
     if args.max_plies <= 0:
         parser.error("--max-plies must be > 0")
+    if args.concurrency <= 0:
+        parser.error("--concurrency must be > 0")
+    # selfplay.py runs quiet per batch, so the oversubscription warning is
+    # printed once here instead.
+    cpu_count = os.cpu_count() or 1
+    if args.concurrency * (args.threads or 1) > cpu_count:
+        print(
+            f"Warning: --concurrency {args.concurrency} x {args.threads or 1} thread(s) exceeds"
+            f" {cpu_count} CPUs; engines will compete for cores and lose effective time",
+            file=sys.stderr,
+        )
     if args.practical_min_games < 0:
         parser.error("--practical-min-games must be >= 0")
     if not (0.0 < args.practical_p_threshold < 1.0):
@@ -173,6 +185,8 @@ def run_batch(args: argparse.Namespace, games: int, seed: int) -> tuple[int, dic
         str(seed),
         "--max-plies",
         str(args.max_plies),
+        "--concurrency",
+        str(args.concurrency),
         "--summary-json",
         str(summary_file),
         "--quiet",
@@ -317,6 +331,7 @@ def main() -> int:
             "max_plies": args.max_plies,
             "threads": args.threads,
             "hash_mb": args.hash_mb,
+            "concurrency": args.concurrency,
             "engine1_opt": list(args.engine1_opt),
             "engine2_opt": list(args.engine2_opt),
             "practical_min_games": args.practical_min_games,
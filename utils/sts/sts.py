@@ -11,12 +11,17 @@ This utility supports STS-style scoring metadata:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import dataclasses
+import functools
 import glob
+import itertools
+import mmap
 import os
 import re
 import sys
-from typing import Dict, List, Optional, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
 
 try:
     import chess
@@ -34,9 +39,22 @@ DEFAULT_ENGINE_PATH = "./zig-out/bin/sykora"
 DEFAULT_EPD_GLOB = "STS*.epd"
 DEFAULT_MOVETIME_MS = 300
 DEFAULT_BM_SCORE = 10
+LOG_FLUSH_LINES = 256
+COMMA_TO_SPACE = str.maketrans(",", " ")
+SCORING_OPCODES = ("bm", "c0", "c8", "c9")
 
+# One EPD operation: opcode followed by a quoted string or bare operands.
+EPD_OPERATION_RE = re.compile(r'\s*([A-Za-z][A-Za-z0-9_]*)(?:\s+("[^"\\]*"|[^;"]*?))?\s*;')
+THEME_NUMBER_RE = re.compile(r"(\d+)")
+UCI_MOVE_RE = re.compile(r"[a-h][1-8][a-h][1-8][qrbn]?$")
+C0_PAIR_RE = re.compile(r'([^\s,;:=\"]+)\s*=\s*(-?\d+)')
 
-@dataclasses.dataclass
+# Many positions have the same bm set (the bundled suites: 673 distinct sets
+# over 1500 positions); identical sets are interned and shared between specs.
+_BM_MOVES_POOL: Dict[Tuple[int, ...], FrozenSet[int]] = {}
+
+
+@dataclasses.dataclass(slots=True)
 class PositionSpec:
     index_in_file: int
     theme: str
@@ -44,15 +62,17 @@ class PositionSpec:
     epd_line: str
     fen: str
     pos_id: str
-    bm_moves: set[str]
-    scored_moves: Dict[str, int]
-
-    @property
-    def max_points(self) -> int:
-        return max(self.scored_moves.values(), default=0)
+    # Moves are stored by _move_key() rather than as UCI strings.
+    bm_moves: FrozenSet[int]
+    scored_moves: Dict[int, int]
+    max_points: int
+    # Parsed once at load time; copy before handing it to an engine.
+    board: chess.Board = dataclasses.field(repr=False, compare=False)
+    # Index of an earlier position with the same FEN; its search is reused.
+    alias_of: Optional[int] = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ScoreTally:
     positions: int = 0
     points: int = 0
@@ -60,8 +80,17 @@ class ScoreTally:
     top_hits: int = 0
     bm_hits: int = 0
     bm_total: int = 0
-
-    def record(self, scored: int, max_scored: int, top_hit: bool, bm_hit: Optional[bool]) -> None:
+    topk_hits: int = 0
+    topk_total: int = 0
+
+    def record(
+        self,
+        scored: int,
+        max_scored: int,
+        top_hit: bool,
+        bm_hit: Optional[bool],
+        topk_hit: Optional[bool] = None,
+    ) -> None:
         self.positions += 1
         self.points += scored
         self.max_points += max_scored
@@ -71,6 +100,48 @@ class ScoreTally:
             self.bm_total += 1
             if bm_hit:
                 self.bm_hits += 1
+        if topk_hit is not None:
+            self.topk_total += 1
+            if topk_hit:
+                self.topk_hits += 1
+
+
+@dataclasses.dataclass(slots=True)
+class PositionTable:
+    # Column-per-field copy of the PositionSpec list holding only what the
+    # scoring loop reads, so it indexes flat lists instead of chasing specs.
+    themes: List[str] = dataclasses.field(default_factory=list)
+    indexes_in_file: List[int] = dataclasses.field(default_factory=list)
+    pos_ids: List[str] = dataclasses.field(default_factory=list)
+    boards: List[chess.Board] = dataclasses.field(default_factory=list)
+    bm_moves: List[FrozenSet[int]] = dataclasses.field(default_factory=list)
+    scored_moves: List[Dict[int, int]] = dataclasses.field(default_factory=list)
+    max_points: List[int] = dataclasses.field(default_factory=list)
+    alias_of: List[Optional[int]] = dataclasses.field(default_factory=list)
+
+    @classmethod
+    def from_specs(cls, specs: Sequence[PositionSpec]) -> PositionTable:
+        table = cls()
+        for spec in specs:
+            table.append(spec)
+        return table
+
+    def append(self, spec: PositionSpec) -> None:
+        self.themes.append(spec.theme)
+        self.indexes_in_file.append(spec.index_in_file)
+        self.pos_ids.append(spec.pos_id)
+        self.boards.append(spec.board)
+        self.bm_moves.append(spec.bm_moves)
+        self.scored_moves.append(spec.scored_moves)
+        self.max_points.append(spec.max_points)
+        self.alias_of.append(spec.alias_of)
+
+    def __len__(self) -> int:
+        return len(self.themes)
+
+
+# Played move plus, with --multipv, the keys of every line's first move.
+SearchResult = Tuple[Optional[chess.Move], Optional[FrozenSet[int]]]
 
 
 def parse_args() -> argparse.Namespace:
@@ -84,8 +155,10 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--epd",
+        action="append",
         required=True,
-        help="Path to an EPD file or a directory containing EPD files.",
+        help="Path to an EPD file or a directory containing EPD files (repeatable; "
+        "all files are run in one engine session).",
     )
     parser.add_argument(
         "--pattern",
@@ -125,6 +198,12 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Engine Hash option in MB, if supported.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of engine processes searching positions in parallel (default: 1).",
+    )
     parser.add_argument(
         "--engine-opt",
         action="append",
@@ -137,6 +216,18 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_BM_SCORE,
         help=f"Score assigned to bm moves if no weighted metadata exists (default: {DEFAULT_BM_SCORE}).",
     )
+    parser.add_argument(
+        "--multipv",
+        type=int,
+        default=1,
+        help="Search K lines per position and report how often the best-scored move is among them (default: 1).",
+    )
+    parser.add_argument(
+        "--clear-tt",
+        action="store_true",
+        help="Send ucinewgame before every position. By default the engine keeps its hash "
+        "between positions, which is faster but lets earlier searches influence later ones.",
+    )
     parser.add_argument(
         "--show",
         choices=("none", "misses", "all"),
@@ -155,6 +246,10 @@ def parse_args() -> argparse.Namespace:
         parser.error("--threads must be > 0")
     if args.hash_mb is not None and args.hash_mb <= 0:
         parser.error("--hash-mb must be > 0")
+    if args.multipv <= 0:
+        parser.error("--multipv must be > 0")
+    if args.workers <= 0:
+        parser.error("--workers must be > 0")
     return args
 
 
@@ -207,29 +302,32 @@ def theme_name_for_file(file_path: str) -> str:
 
 
 def sort_key_for_theme(theme: str) -> Tuple[int, str]:
-    match = re.search(r"(\d+)", theme)
+    match = THEME_NUMBER_RE.search(theme)
     if match:
         return int(match.group(1)), theme
     return (10_000, theme)
 
 
-def _extract_fen4(epd_line: str) -> str:
-    tokens = epd_line.strip().split()
-    if len(tokens) < 4:
-        raise ValueError("EPD line does not contain 4 FEN fields.")
-    return " ".join(tokens[:4])
-
-
 def _parse_ints(text: str) -> List[int]:
-    return [int(value) for value in re.findall(r"-?\d+", text)]
+    # c8 is a plain list of integers, so split instead of running a regex and
+    # skip any token that isn't an optionally negative decimal number.
+    values: List[int] = []
+    for token in text.translate(COMMA_TO_SPACE).split():
+        digits = token[1:] if token.startswith("-") else token
+        if digits.isdecimal():
+            values.append(int(token))
+    return values
 
 
 def _parse_move_tokens(text: str) -> List[str]:
-    tokens = re.split(r"[,\s]+", text.strip())
-    return [token for token in tokens if token]
+    return text.translate(COMMA_TO_SPACE).split()
 
 
-def _token_to_uci(board: chess.Board, token: str) -> Optional[str]:
+def _move_key(move: chess.Move) -> int:
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
+def _token_to_move(board: chess.Board, token: str) -> Optional[chess.Move]:
     token = token.strip()
     if not token:
         return None
@@ -237,32 +335,58 @@ def _token_to_uci(board: chess.Board, token: str) -> Optional[str]:
     token = token.rstrip(",")
     token = token.replace("0-0-0", "O-O-O").replace("0-0", "O-O")
 
-    try:
-        move = chess.Move.from_uci(token.lower())
-        if move in board.legal_moves:
-            return move.uci()
-    except ValueError:
-        pass
+    # Most c9 tokens are SAN; only try UCI when the token has its shape so the
+    # common case doesn't pay for a raised and caught ValueError.
+    lowered = token.lower()
+    if UCI_MOVE_RE.match(lowered):
+        try:
+            move = chess.Move.from_uci(lowered)
+        except ValueError:
+            # Only same-square moves like "a1a1" get here.
+            return None
+        if board.is_legal(move):
+            return move
 
     try:
-        return board.parse_san(token).uci()
+        return board.parse_san(token)
     except ValueError:
         return None
 
 
-def _scored_moves_from_c0(c0_value: str, board: chess.Board) -> Dict[str, int]:
-    scores: Dict[str, int] = {}
-    for move_token, score_str in re.findall(r'([^\s,;:=\"]+)\s*=\s*(-?\d+)', c0_value):
-        uci = _token_to_uci(board, move_token)
-        if uci is None:
+def _scored_moves_from_c0(c0_value: str, board: chess.Board) -> Dict[int, int]:
+    scores: Dict[int, int] = {}
+    for move_token, score_str in C0_PAIR_RE.findall(c0_value):
+        move = _token_to_move(board, move_token)
+        if move is None:
             continue
+        key = _move_key(move)
         score = int(score_str)
-        previous = scores.get(uci)
+        previous = scores.get(key)
         if previous is None or score > previous:
-            scores[uci] = score
+            scores[key] = score
     return scores
 
 
+def _parse_epd_operations(text: str) -> Optional[Dict[str, str]]:
+    # Fast path for the plain operations STS files use. Returns None when the
+    # text needs python-chess's full EPD grammar (escapes, stray tokens).
+    operations: Dict[str, str] = {}
+    pos = 0
+    end = len(text)
+    while pos < end:
+        match = EPD_OPERATION_RE.match(text, pos)
+        if match is None:
+            if text[pos:].strip():
+                return None
+            break
+        opcode, value = match.groups()
+        if value and value.startswith('"'):
+            value = value[1:-1]
+        operations[opcode] = value or ""
+        pos = match.end()
+    return operations
+
+
 def parse_epd_line(
     line: str,
     source_file: str,
@@ -274,31 +398,49 @@ def parse_epd_line(
     if not stripped or stripped.startswith("#"):
         return None
 
+    # Only the four FEN fields and the operation tail are needed.
+    parts = stripped.split(None, 4)
+    if len(parts) < 5:
+        return None
+    # Without any scoring opcode the line can only be rejected, so skip the
+    # board setup. A match inside e.g. an id string just takes the full path.
+    ops_text = parts[4]
+    if not any(tag in ops_text for tag in SCORING_OPCODES):
+        return None
+    fen4 = " ".join(parts[:4])
+    operations = _parse_epd_operations(ops_text)
     board = chess.Board()
     try:
-        operations = board.set_epd(stripped)
+        if operations is not None:
+            bm_text = operations.get("bm")
+            if bm_text is not None:
+                operations["bm"] = bm_text.split()
+            board.set_fen(
+                f"{fen4} {int(operations.get('hmvc', 0))} {int(operations.get('fmvn', 1))}"
+            )
+        else:
+            operations = board.set_epd(stripped)
     except ValueError:
         return None
 
-    fen4 = _extract_fen4(stripped)
     hmvc = int(operations.get("hmvc", 0))
     fmvn = int(operations.get("fmvn", 1))
     fen = f"{fen4} {hmvc} {fmvn}"
 
     pos_id = str(operations.get("id", f"{theme}.{index_in_file:03d}"))
 
-    bm_moves: set[str] = set()
+    bm_keys: List[int] = []
     bm_value = operations.get("bm")
     if isinstance(bm_value, list):
         for move in bm_value:
-            if isinstance(move, chess.Move):
-                bm_moves.add(move.uci())
-            else:
-                uci = _token_to_uci(board, str(move))
-                if uci:
-                    bm_moves.add(uci)
+            if not isinstance(move, chess.Move):
+                move = _token_to_move(board, str(move))
+            if move:
+                bm_keys.append(_move_key(move))
+    pool_key = tuple(sorted(set(bm_keys)))
+    bm_moves = _BM_MOVES_POOL.setdefault(pool_key, frozenset(pool_key))
 
-    scored_moves: Dict[str, int] = {}
+    scored_moves: Dict[int, int] = {}
 
     c8 = operations.get("c8")
     c9 = operations.get("c9")
@@ -306,12 +448,13 @@ def parse_epd_line(
         score_values = _parse_ints(str(c8))
         move_tokens = _parse_move_tokens(str(c9))
         for token, score in zip(move_tokens, score_values):
-            uci = _token_to_uci(board, token)
-            if uci is None:
+            move = _token_to_move(board, token)
+            if move is None:
                 continue
-            previous = scored_moves.get(uci)
+            key = _move_key(move)
+            previous = scored_moves.get(key)
             if previous is None or score > previous:
-                scored_moves[uci] = score
+                scored_moves[key] = score
 
     if not scored_moves:
         c0 = operations.get("c0")
@@ -333,37 +476,71 @@ def parse_epd_line(
         pos_id=pos_id,
         bm_moves=bm_moves,
         scored_moves=scored_moves,
+        max_points=max(scored_moves.values(), default=0),
+        board=board,
     )
 
 
-def load_positions(epd_files: Sequence[str], max_positions: int, bm_score: int) -> List[PositionSpec]:
+def load_epd_file(file_path: str, bm_score: int, max_positions: int = 0) -> List[PositionSpec]:
     positions: List[PositionSpec] = []
-    for file_path in epd_files:
-        theme = theme_name_for_file(file_path)
-        with open(file_path, "r", encoding="utf-8", errors="replace") as handle:
-            local_index = 0
-            for raw_line in handle:
+    theme = theme_name_for_file(file_path)
+    with open(file_path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return positions
+        # Scan the mapped bytes and only decode lines that will be parsed.
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for raw_line in iter(mapped.readline, b""):
+                raw_line = raw_line.strip()
+                if not raw_line or raw_line.startswith(b"#"):
+                    continue
                 parsed = parse_epd_line(
-                    line=raw_line,
+                    line=raw_line.decode("utf-8", "replace"),
                     source_file=file_path,
-                    index_in_file=local_index + 1,
+                    index_in_file=len(positions) + 1,
                     theme=theme,
                     bm_score=bm_score,
                 )
                 if parsed is None:
                     continue
-                local_index += 1
                 positions.append(parsed)
                 if max_positions > 0 and len(positions) >= max_positions:
-                    return positions
+                    break
+    return positions
+
+
+def load_positions(epd_files: Sequence[str], max_positions: int, bm_score: int) -> List[PositionSpec]:
+    parse = functools.partial(load_epd_file, bm_score=bm_score, max_positions=max_positions)
+    cpu_count = os.cpu_count() or 1
+    if len(epd_files) > 1 and cpu_count > 1:
+        # SAN parsing is CPU-bound Python, so spread files over processes.
+        # map() yields results in input order, keeping themes in file order.
+        with ProcessPoolExecutor(max_workers=min(len(epd_files), cpu_count)) as executor:
+            per_file = executor.map(parse, epd_files)
+            positions = list(itertools.chain.from_iterable(per_file))
+    else:
+        positions = []
+        for file_path in epd_files:
+            positions.extend(parse(file_path))
+            if max_positions > 0 and len(positions) >= max_positions:
+                break
+
+    if max_positions > 0:
+        del positions[max_positions:]
+
+    first_seen: Dict[str, int] = {}
+    for index, position in enumerate(positions):
+        first = first_seen.setdefault(position.fen, index)
+        if first != index:
+            position.alias_of = first
     return positions
 
 
-def configure_engine(
-    engine: chess.engine.SimpleEngine,
+async def configure_engine(
+    engine: chess.engine.UciProtocol,
     threads: Optional[int],
     hash_mb: Optional[int],
     extra_options: Dict[str, object],
+    warn: bool = True,
 ) -> None:
     config: Dict[str, object] = {}
     if threads is not None and "Threads" in engine.options:
@@ -373,18 +550,46 @@ def configure_engine(
     for key, value in extra_options.items():
         if key in engine.options:
             config[key] = value
-        else:
+        elif warn:
             print(f"Warning: engine does not expose option '{key}', skipping", file=sys.stderr)
     if config:
-        engine.configure(config)
+        await engine.configure(config)
+
+
+async def safe_quit(engine: chess.engine.UciProtocol) -> None:
+    try:
+        await engine.quit()
+    except chess.engine.EngineTerminatedError:
+        pass
 
 
-def evaluate_positions(
-    engine: chess.engine.SimpleEngine,
-    positions: Sequence[PositionSpec],
+async def start_engines(
+    engine_path: str,
+    count: int,
+    threads: Optional[int],
+    hash_mb: Optional[int],
+    extra_options: Dict[str, object],
+) -> List[chess.engine.UciProtocol]:
+    engines: List[chess.engine.UciProtocol] = []
+    try:
+        for index in range(count):
+            _, engine = await chess.engine.popen_uci(engine_path)
+            engines.append(engine)
+            await configure_engine(engine, threads, hash_mb, extra_options, warn=index == 0)
+    except BaseException:
+        await asyncio.gather(*(safe_quit(engine) for engine in engines))
+        raise
+    return engines
+
+
+async def evaluate_positions(
+    engines: Sequence[chess.engine.UciProtocol],
+    positions: PositionTable,
     movetime_ms: Optional[int],
     depth: Optional[int],
     show_mode: str,
+    multipv: int = 1,
+    clear_tt: bool = False,
 ) -> Tuple[Dict[str, ScoreTally], ScoreTally]:
     by_theme: Dict[str, ScoreTally] = {}
     overall = ScoreTally()
@@ -395,34 +600,167 @@ def evaluate_positions(
         assert movetime_ms is not None
         limit = chess.engine.Limit(time=movetime_ms / 1000.0)
 
-    for idx, position in enumerate(positions, start=1):
-        board = chess.Board(position.fen)
-        play_result = engine.play(board, limit)
-        played_uci = play_result.move.uci() if play_result.move else "0000"
+    # Searches finish in any order; score them in position order so the log
+    # and tallies match a single-engine run.
+    pending: Dict[int, SearchResult] = {}
+    count = len(positions)
+    played: List[SearchResult] = [(None, None)] * count
+    themes = positions.themes
+    scored_moves = positions.scored_moves
+    max_points = positions.max_points
+    bm_moves = positions.bm_moves
+    alias_of = positions.alias_of
+    next_idx = 1
+    log_lines: List[str] = []
+
+    def flush_log() -> None:
+        if log_lines:
+            sys.stdout.write("\n".join(log_lines) + "\n")
+            sys.stdout.flush()
+            log_lines.clear()
+
+    def record(result_idx: int, result: SearchResult) -> None:
+        nonlocal next_idx
+        pending[result_idx] = result
+        while next_idx <= count:
+            i = next_idx - 1
+            alias = alias_of[i]
+            if alias is not None:
+                result = played[alias]
+            elif next_idx in pending:
+                result = pending.pop(next_idx)
+            else:
+                break
+            played[i] = result
+            move, top_keys = result
+            played_key = _move_key(move) if move else -1
+
+            scores = scored_moves[i]
+            scored = scores.get(played_key, 0)
+            max_scored = max_points[i]
+            top_hit = max_scored > 0 and scored == max_scored
+
+            bm_hit: Optional[bool]
+            bm_set = bm_moves[i]
+            if bm_set:
+                bm_hit = played_key in bm_set
+            else:
+                bm_hit = None
 
-        scored = position.scored_moves.get(played_uci, 0)
-        max_scored = position.max_points
-        top_hit = max_scored > 0 and scored == max_scored
+            topk_hit: Optional[bool] = None
+            if top_keys is not None:
+                topk_hit = max_scored > 0 and any(
+                    scores.get(key) == max_scored for key in top_keys
+                )
 
-        bm_hit: Optional[bool]
-        if position.bm_moves:
-            bm_hit = played_uci in position.bm_moves
-        else:
-            bm_hit = None
+            # Same updates as ScoreTally.record, inlined for both tallies.
+            theme = themes[i]
+            tally = by_theme.get(theme)
+            if tally is None:
+                tally = by_theme[theme] = ScoreTally()
+            for target in (tally, overall):
+                target.positions += 1
+                target.points += scored
+                target.max_points += max_scored
+                if top_hit:
+                    target.top_hits += 1
+                if bm_hit is not None:
+                    target.bm_total += 1
+                    if bm_hit:
+                        target.bm_hits += 1
+                if topk_hit is not None:
+                    target.topk_total += 1
+                    if topk_hit:
+                        target.topk_hits += 1
+
+            if show_mode == "all" or (show_mode == "misses" and not top_hit):
+                played_uci = move.uci() if move else "0000"
+                log_lines.append(
+                    f"[{next_idx:4d}] {theme} #{positions.indexes_in_file[i]:03d} "
+                    f"id=\"{positions.pos_ids[i]}\" move={played_uci} score={scored}/{max_scored}"
+                )
+                if len(log_lines) >= LOG_FLUSH_LINES:
+                    flush_log()
+            next_idx += 1
+
+    # Engines pull from one shared iterator, so a free engine always takes the
+    # next position while the others are still searching.
+    # Duplicate FENs are not searched again; they are scored from the first
+    # occurrence's move, still counting toward their own theme.
+    jobs = (
+        (idx, board)
+        for idx, (board, alias) in enumerate(zip(positions.boards, alias_of), start=1)
+        if alias is None
+    )
 
-        tally = by_theme.setdefault(position.theme, ScoreTally())
-        tally.record(scored, max_scored, top_hit, bm_hit)
-        overall.record(scored, max_scored, top_hit, bm_hit)
+    async def search_worker(engine: chess.engine.UciProtocol) -> None:
+        use_multipv = multipv > 1 and "MultiPV" in engine.options
+        for idx, board in jobs:
+            board = board.copy(stack=False)
+            # python-chess sends ucinewgame whenever the game object changes,
+            # so a fixed None keeps the hash and a per-position key clears it.
+            game = idx if clear_tt else None
+            if use_multipv:
+                # One search yields all K lines; the first line's move is the
+                # one that gets scored.
+                infos = await engine.analyse(board, limit, multipv=multipv, game=game, info=chess.engine.INFO_PV)
+                firsts = [info["pv"][0] for info in infos if info.get("pv")]
+                record(idx, (firsts[0] if firsts else None, frozenset(_move_key(m) for m in firsts)))
+            else:
+                play_result = await engine.play(board, limit, game=game)
+                record(idx, (play_result.move, None))
 
-        if show_mode == "all" or (show_mode == "misses" and not top_hit):
-            print(
-                f"[{idx:4d}] {position.theme} #{position.index_in_file:03d} "
-                f"id=\"{position.pos_id}\" move={played_uci} score={scored}/{max_scored}"
-            )
+    workers = [asyncio.create_task(search_worker(engine)) for engine in engines]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        flush_log()
 
     return by_theme, overall
 
 
+async def run_suite(
+    engine_path: str,
+    workers: int,
+    threads: Optional[int],
+    hash_mb: Optional[int],
+    extra_options: Dict[str, object],
+    positions: PositionTable,
+    movetime_ms: Optional[int],
+    depth: Optional[int],
+    show_mode: str,
+    multipv: int = 1,
+    clear_tt: bool = False,
+) -> Optional[Tuple[Dict[str, ScoreTally], ScoreTally]]:
+    try:
+        engines = await start_engines(engine_path, workers, threads, hash_mb, extra_options)
+    except FileNotFoundError:
+        print(f"Error: engine not found: {engine_path}", file=sys.stderr)
+        return None
+    except Exception as error:
+        print(f"Error: failed to start engine: {error}", file=sys.stderr)
+        return None
+
+    if multipv > 1 and "MultiPV" not in engines[0].options:
+        print("Warning: engine does not expose option 'MultiPV', searching single lines", file=sys.stderr)
+
+    try:
+        return await evaluate_positions(
+            engines=engines,
+            positions=positions,
+            movetime_ms=movetime_ms,
+            depth=depth,
+            show_mode=show_mode,
+            multipv=multipv,
+            clear_tt=clear_tt,
+        )
+    finally:
+        await asyncio.gather(*(safe_quit(engine) for engine in engines))
+
+
 def pct(numerator: int, denominator: int) -> float:
     if denominator <= 0:
         return 0.0
@@ -430,31 +768,36 @@ def pct(numerator: int, denominator: int) -> float:
 
 
 def print_summary(by_theme: Dict[str, ScoreTally], overall: ScoreTally) -> None:
-    print("\nTheme Summary")
-    print(
+    # The top-k column only appears for --multipv runs.
+    show_topk = overall.topk_total > 0
+    width = 83 if show_topk else 74
+    header = (
         f"{'Theme':<14} {'Pos':>5} {'Score':>10} {'Max':>10} "
         f"{'Score%':>8} {'Top%':>8} {'BM%':>8}"
     )
-    print("-" * 74)
+    if show_topk:
+        header += f" {'TopK%':>8}"
+    out: List[str] = ["", "Theme Summary", header, "-" * width]
 
-    for theme in sorted(by_theme.keys(), key=sort_key_for_theme):
-        tally = by_theme[theme]
+    def row(label: str, tally: ScoreTally) -> str:
         score_pct = pct(tally.points, tally.max_points)
         top_pct = pct(tally.top_hits, tally.positions)
         bm_pct = pct(tally.bm_hits, tally.bm_total) if tally.bm_total else 0.0
-        print(
-            f"{theme:<14} {tally.positions:>5d} {tally.points:>10d} {tally.max_points:>10d} "
+        line = (
+            f"{label:<14} {tally.positions:>5d} {tally.points:>10d} {tally.max_points:>10d} "
             f"{score_pct:>7.2f}% {top_pct:>7.2f}% {bm_pct:>7.2f}%"
         )
+        if show_topk:
+            line += f" {pct(tally.topk_hits, tally.topk_total):>7.2f}%"
+        return line
 
-    print("-" * 74)
-    overall_score_pct = pct(overall.points, overall.max_points)
-    overall_top_pct = pct(overall.top_hits, overall.positions)
-    overall_bm_pct = pct(overall.bm_hits, overall.bm_total) if overall.bm_total else 0.0
-    print(
-        f"{'TOTAL':<14} {overall.positions:>5d} {overall.points:>10d} {overall.max_points:>10d} "
-        f"{overall_score_pct:>7.2f}% {overall_top_pct:>7.2f}% {overall_bm_pct:>7.2f}%"
-    )
+    for theme in sorted(by_theme.keys(), key=sort_key_for_theme):
+        out.append(row(theme, by_theme[theme]))
+
+    out.append("-" * width)
+    out.append(row("TOTAL", overall))
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
 
 
 def main() -> int:
@@ -466,7 +809,12 @@ def main() -> int:
         return 2
 
     try:
-        epd_files = find_epd_files(args.epd, args.pattern)
+        # Keep first-seen order and drop files named twice.
+        epd_files = list(
+            dict.fromkeys(
+                file_path for epd_path in args.epd for file_path in find_epd_files(epd_path, args.pattern)
+            )
+        )
     except FileNotFoundError as error:
         print(f"Error: {error}", file=sys.stderr)
         return 1
@@ -479,29 +827,44 @@ def main() -> int:
     limit_desc = f"depth={args.depth}" if args.depth is not None else f"movetime={args.movetime_ms}ms"
     print(f"Engine: {args.engine}")
     print(f"Files: {len(epd_files)} | Positions: {len(positions)} | Limit: {limit_desc}")
+    duplicates = sum(1 for position in positions if position.alias_of is not None)
+    if duplicates:
+        print(f"Duplicate FENs: {duplicates} (searched once, scored per theme)")
+    if args.workers > 1:
+        print(f"Workers: {args.workers}")
     if extra_options:
         print(f"Extra engine options: {extra_options}")
 
-    try:
-        engine = chess.engine.SimpleEngine.popen_uci(args.engine)
-    except FileNotFoundError:
-        print(f"Error: engine not found: {args.engine}", file=sys.stderr)
-        return 1
-    except Exception as error:
-        print(f"Error: failed to start engine: {error}", file=sys.stderr)
-        return 1
+    # Parallel workers only pay off with single-threaded engines, so default
+    # Threads to 1 unless the caller asked for something else.
+    threads = args.threads
+    if threads is None and args.workers > 1:
+        threads = 1
+    cpu_count = os.cpu_count()
+    if cpu_count is not None and args.workers * (threads or 1) > cpu_count:
+        print(
+            f"Warning: {args.workers} workers x {threads or 1} threads exceeds {cpu_count} CPUs",
+            file=sys.stderr,
+        )
 
-    try:
-        configure_engine(engine, args.threads, args.hash_mb, extra_options)
-        by_theme, overall = evaluate_positions(
-            engine=engine,
-            positions=positions,
+    outcome = asyncio.run(
+        run_suite(
+            engine_path=args.engine,
+            workers=args.workers,
+            threads=threads,
+            hash_mb=args.hash_mb,
+            extra_options=extra_options,
+            positions=PositionTable.from_specs(positions),
             movetime_ms=args.movetime_ms if args.depth is None else None,
             depth=args.depth,
             show_mode=args.show,
+            multipv=args.multipv,
+            clear_tt=args.clear_tt,
         )
-    finally:
-        engine.quit()
+    )
+    if outcome is None:
+        return 1
+    by_theme, overall = outcome
 
     print_summary(by_theme, overall)
     return 0